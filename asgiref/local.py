@@ -1,8 +1,93 @@
-import random
-import string
+import itertools
 import sys
 import threading
+import types
 import weakref
+from typing import Any, Dict, Mapping, Optional
+
+# Creating shared storage is rare and brief, so rather than every Local
+# allocating its own lock, they share a small fixed pool of them. They must
+# stay re-entrant: a garbage collection triggered while one is held can run
+# finalizers that create storage for another Local on the same stripe.
+_storage_locks = [threading.RLock() for _ in range(16)]
+
+# Numbers each Local's storage attribute; next() on it is atomic.
+_local_ids = itertools.count()
+
+# Stands in for the storage of contexts that have none yet, so lookups can
+# miss on it directly. Read-only, so it can be shared safely.
+_EMPTY: Mapping[str, Any] = types.MappingProxyType({})
+
+# Returned by launch map lookups that have no entry.
+_no_source = object()
+
+
+# asgiref.sync imports this module, so it can only be imported once first
+# needed. Keep hold of it then, rather than re-running the import machinery on
+# every lookup.
+_sync: Any = None
+
+
+def _import_sync():
+    global _sync
+    # Prevent a circular reference
+    from . import sync
+
+    _sync = sync
+    return sync
+
+
+def _get_thread_critical_context_id():
+    """
+    Get the ID thread-critical Locals look up variables under: the current
+    task if there is one, otherwise the current thread.
+    """
+    sync = _sync or _import_sync()
+    context_id = sync.SyncToAsync.get_current_task()
+    if context_id is None:
+        context_id = threading.current_thread()
+    return context_id
+
+
+def _get_shared_context_id():
+    """
+    Get the ID other Locals look up variables under, resolving the current
+    task or thread back through the launch maps to where it came from.
+    """
+    sync = _sync or _import_sync()
+    # Every resolution ends on a miss, so look the sources up with bound
+    # dict.get methods rather than raising and catching a KeyError each time.
+    # A sentinel marks the miss, as SyncToAsync can record a None source task.
+    get_task_source = sync.AsyncToSync.launch_map.get
+    get_thread_source = sync.SyncToAsync.launch_map.get
+
+    # First, pull the current task if we can
+    context_id = sync.SyncToAsync.get_current_task()
+    context_is_async = True
+    # OK, let's try for a thread ID
+    if context_id is None:
+        context_id = threading.current_thread()
+        context_is_async = False
+    # Now, take those and see if we can resolve them through the launch maps.
+    # Most lookups stop at the first step, so count the steps by hand rather
+    # than setting up a range to iterate over.
+    depth = 0
+    while True:
+        if context_is_async:
+            # Tasks have a source thread in AsyncToSync
+            source_id = get_task_source(context_id, _no_source)
+        else:
+            # Threads have a source task in SyncToAsync
+            source_id = get_thread_source(context_id, _no_source)
+        if source_id is _no_source:
+            return context_id
+        context_id = source_id
+        context_is_async = not context_is_async
+        depth += 1
+        if depth >= sys.getrecursionlimit():
+            # Catch infinite loops (they happen if you are screwing around
+            # with AsyncToSync implementations)
+            raise RuntimeError("Infinite launch_map loops")
 
 
 class Local:
@@ -30,61 +115,62 @@ class Local:
     3.7 only, we can then reimplement the storage more nicely.
     """
 
+    # Values live in per-context storage, so the instance itself only needs
+    # room for its own bookkeeping.
+    __slots__ = (
+        "_thread_critical",
+        "_get_context_id",
+        "_context_refs",
+        "_attr_name",
+        "_empty",
+        "__weakref__",
+    )
+
     def __init__(self, thread_critical: bool = False) -> None:
         self._thread_critical = thread_critical
-        self._thread_lock = threading.RLock()
-        self._context_refs: "weakref.WeakSet[object]" = weakref.WeakSet()
-        # Random suffixes stop accidental reuse between different Locals,
-        # though we try to force deletion as well.
-        self._attr_name = "_asgiref_local_impl_{}_{}".format(
-            id(self),
-            "".join(random.choice(string.ascii_letters) for i in range(8)),
-        )
-
-    def _get_context_id(self):
-        """
-        Get the ID we should use for looking up variables
-        """
-        # Prevent a circular reference
-        from .sync import AsyncToSync, SyncToAsync
-
-        # First, pull the current task if we can
-        context_id = SyncToAsync.get_current_task()
-        context_is_async = True
-        # OK, let's try for a thread ID
-        if context_id is None:
-            context_id = threading.current_thread()
-            context_is_async = False
-        # If we're thread-critical, we stop here, as we can't share contexts.
-        if self._thread_critical:
-            return context_id
-        # Now, take those and see if we can resolve them through the launch maps
-        for i in range(sys.getrecursionlimit()):
-            try:
-                if context_is_async:
-                    # Tasks have a source thread in AsyncToSync
-                    context_id = AsyncToSync.launch_map[context_id]
-                    context_is_async = False
-                else:
-                    # Threads have a source task in SyncToAsync
-                    context_id = SyncToAsync.launch_map[context_id]
-                    context_is_async = True
-            except KeyError:
-                break
+        # Pick the context resolution once, rather than re-checking
+        # thread_critical on every attribute access.
+        if thread_critical:
+            self._get_context_id = _get_thread_critical_context_id
         else:
-            # Catch infinite loops (they happen if you are screwing around
-            # with AsyncToSync implementations)
-            raise RuntimeError("Infinite launch_map loops")
-        return context_id
+            self._get_context_id = _get_shared_context_id
+        # Until something is written to this Local in any context, every
+        # lookup is a miss, so skip resolving the context at all.
+        self._empty = True
+        # Only made once the Local is first written to, as many never are.
+        self._context_refs: "Optional[weakref.WeakSet[object]]" = None
+        # A process-wide counter stops accidental reuse between different
+        # Locals, though we try to force deletion as well.
+        self._attr_name = f"_asgiref_local_impl_{next(_local_ids)}"
 
-    def _get_storage(self):
-        context_obj = self._get_context_id()
-        if not hasattr(context_obj, self._attr_name):
-            setattr(context_obj, self._attr_name, {})
-            self._context_refs.add(context_obj)
-        return getattr(context_obj, self._attr_name)
+    def _create_storage(self, context_obj):
+        """
+        Get the storage dict for context_obj, creating it if it is missing.
+        """
+        # Thread-critical contexts are only ever touched from their own
+        # thread, so once there is somewhere to record them they need no
+        # lock. Shared ones can be reached from several threads at once, so
+        # creating their storage needs to be serialised.
+        context_refs = self._context_refs
+        if self._thread_critical and context_refs is not None:
+            storage = {}
+            setattr(context_obj, self._attr_name, storage)
+            context_refs.add(context_obj)
+            return storage
+        # Drop the always-zero low bits of id(), as objects are aligned
+        with _storage_locks[(id(self) >> 4) % len(_storage_locks)]:
+            storage = getattr(context_obj, self._attr_name, _EMPTY)
+            if storage is _EMPTY:
+                if self._context_refs is None:
+                    super().__setattr__("_context_refs", weakref.WeakSet())
+                storage = {}
+                setattr(context_obj, self._attr_name, storage)
+                self._context_refs.add(context_obj)
+            return storage
 
     def __del__(self):
+        if self._context_refs is None:
+            return
         try:
             for context_obj in self._context_refs:
                 try:
@@ -96,25 +182,110 @@ class Local:
             # to _IterationGuard being None.
             pass
 
+    def use(self, **overrides):
+        """
+        Sets the given attributes for the duration of a with block, then puts
+        back whatever values they had before (or removes them if they were
+        unset). Only the overridden attributes are saved and restored.
+        """
+        internal = _internal_attrs.intersection(overrides)
+        if internal:
+            raise ValueError(
+                f"Cannot override internal Local attributes: {sorted(internal)}"
+            )
+        return _LocalOverrides(self, overrides)
+
+    # Once the storage dict exists, single dict operations are atomic, so the
+    # accessors below do not take a lock; missing keys are detected with
+    # KeyError rather than a separate membership test so a concurrent delete
+    # cannot slip in between the check and the access. Contexts without
+    # storage yet get _EMPTY, which every key misses on, and only writes
+    # create real storage.
+
     def __getattr__(self, key):
-        with self._thread_lock:
-            storage = self._get_storage()
-            if key in storage:
-                return storage[key]
-            else:
-                raise AttributeError(f"{self!r} object has no attribute {key!r}")
+        if self._empty:
+            raise AttributeError(f"{self!r} object has no attribute {key!r}")
+        storage = getattr(self._get_context_id(), self._attr_name, _EMPTY)
+        try:
+            return storage[key]
+        except KeyError:
+            raise AttributeError(f"{self!r} object has no attribute {key!r}") from None
 
     def __setattr__(self, key, value):
-        if key in ("_context_refs", "_thread_critical", "_thread_lock", "_attr_name"):
+        if key in _internal_attrs:
+            if key in _method_names:
+                raise AttributeError(
+                    f"{self!r} object attribute {key!r} is a method and "
+                    "cannot be stored"
+                )
             return super().__setattr__(key, value)
-        with self._thread_lock:
-            storage = self._get_storage()
-            storage[key] = value
+        context_obj = self._get_context_id()
+        storage = getattr(context_obj, self._attr_name, _EMPTY)
+        if storage is _EMPTY:
+            storage = self._create_storage(context_obj)
+            if self._empty:
+                super().__setattr__("_empty", False)
+        storage[key] = value
 
     def __delattr__(self, key):
-        with self._thread_lock:
-            storage = self._get_storage()
-            if key in storage:
+        if key in _method_names:
+            raise AttributeError(
+                f"{self!r} object attribute {key!r} is a method and cannot be deleted"
+            )
+        if self._empty:
+            raise AttributeError(f"{self!r} object has no attribute {key!r}")
+        storage = getattr(self._get_context_id(), self._attr_name, _EMPTY)
+        if storage is not _EMPTY:
+            try:
                 del storage[key]
+                return
+            except KeyError:
+                pass
+        raise AttributeError(f"{self!r} object has no attribute {key!r}")
+
+
+class _LocalOverrides:
+    """
+    Context manager returned by Local.use(). A plain class rather than a
+    contextlib.contextmanager generator, so entering and leaving it is just
+    two method calls.
+    """
+
+    __slots__ = ("local", "overrides", "saved")
+
+    def __init__(self, local, overrides):
+        self.local = local
+        self.overrides = overrides
+
+    def __enter__(self):
+        local = self.local
+        saved: "Dict[str, Any]" = {}
+        self.saved = saved
+        for key in self.overrides:
+            try:
+                saved[key] = local.__getattr__(key)
+            except AttributeError:
+                pass
+        for key, value in self.overrides.items():
+            local.__setattr__(key, value)
+        return local
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        local = self.local
+        for key in self.overrides:
+            if key in self.saved:
+                local.__setattr__(key, self.saved[key])
             else:
-                raise AttributeError(f"{self!r} object has no attribute {key!r}")
+                try:
+                    local.__delattr__(key)
+                except AttributeError:
+                    pass
+
+
+# Names of Local's public methods. Storing values under these would be
+# shadowed by the method on reads, so writes and deletes refuse them.
+_method_names = frozenset({"use"})
+
+# Lets Local.__setattr__ tell internal attributes apart from stored ones with
+# a single hash lookup.
+_internal_attrs = frozenset(Local.__slots__) | _method_names
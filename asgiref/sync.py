@@ -14,16 +14,16 @@ from typing import Any, Callable, Dict, Optional, overload
 from .current_thread_executor import CurrentThreadExecutor
 from .local import Local
 
+_unset = object()
+
 
 def _restore_context(context):
     # Check for changes in contextvars, and set them to the current
-    # context for downstream consumers
-    for cvar in context:
-        try:
-            if cvar.get() != context.get(cvar):
-                cvar.set(context.get(cvar))
-        except LookupError:
-            cvar.set(context.get(cvar))
+    # context for downstream consumers. Each set() copies the context's
+    # underlying mapping, so skip values that are already bound here.
+    for cvar, value in context.items():
+        if cvar.get(_unset) is not value:
+            cvar.set(value)
 
 
 # Python 3.12 deprecates asyncio.iscoroutinefunction() as an alias for
@@ -496,10 +496,12 @@ class SyncToAsync:
         Implementation of asyncio.current_task()
         that returns None if there is no task.
         """
-        try:
-            return asyncio.current_task()
-        except RuntimeError:
+        # Called on every Local access; unlike current_task(), this returns
+        # None rather than raising when there is no running loop.
+        loop = asyncio._get_running_loop()
+        if loop is None:
             return None
+        return asyncio.current_task(loop)
 
 
 # Lowercase aliases (and decorator friendliness)
@@ -44,6 +44,100 @@ def test_local_thread():
         test_local.foo
 
 
+def test_local_read_does_not_create_storage():
+    """
+    Tests that reading or deleting a missing attribute does not attach any
+    storage to the current context
+    """
+
+    def storage_attrs():
+        return {
+            name
+            for name in vars(threading.current_thread())
+            if name.startswith("_asgiref_local_impl_")
+        }
+
+    test_local = Local()
+    # Write from another thread first, so this Local is not empty overall
+    thread = threading.Thread(target=setattr, args=(test_local, "bar", 1))
+    thread.start()
+    thread.join()
+
+    before = storage_attrs()
+    with pytest.raises(AttributeError):
+        test_local.foo
+    with pytest.raises(AttributeError):
+        del test_local.foo
+    assert storage_attrs() == before
+    # Writing afterwards still works as normal
+    test_local.foo = 1
+    assert test_local.foo == 1
+
+
+def test_local_use():
+    """
+    Tests that Local.use sets values for the block and restores them after,
+    including through nesting and exceptions
+    """
+
+    test_local = Local()
+    test_local.foo = 1
+    with test_local.use(foo=2, bar=3):
+        assert test_local.foo == 2
+        assert test_local.bar == 3
+        with pytest.raises(ValueError):
+            with test_local.use(bar=4):
+                assert test_local.bar == 4
+                raise ValueError()
+        assert test_local.bar == 3
+    assert test_local.foo == 1
+    with pytest.raises(AttributeError):
+        test_local.bar
+
+
+def test_local_use_rejects_internal_names():
+    """
+    Tests that Local.use refuses to override Local's own attributes, and
+    leaves stored values intact
+    """
+
+    test_local = Local()
+    test_local.foo = 1
+    with pytest.raises(ValueError):
+        test_local.use(_attr_name="x")
+    with pytest.raises(ValueError):
+        test_local.use(foo=2, _empty=True)
+    assert test_local.foo == 1
+
+
+def test_local_use_name_reserved():
+    """
+    Tests that the name of Local.use cannot be stored to or deleted, rather
+    than the value being silently shadowed by the method
+    """
+
+    test_local = Local()
+    with pytest.raises(AttributeError):
+        test_local.use = 5
+    with pytest.raises(AttributeError):
+        del test_local.use
+    assert callable(test_local.use)
+
+
+def test_local_subclass_unhashable():
+    """
+    Tests that Local subclasses do not need to be hashable
+    """
+
+    class EqLocal(Local):
+        def __eq__(self, other):
+            return self is other
+
+    test_local = EqLocal()
+    test_local.foo = 1
+    assert test_local.foo == 1
+
+
 def test_local_thread_nested():
     """
     Tests that local does not leak across threads
@@ -309,6 +403,7 @@ async def test_local_threads_and_tasks():
 
 def test_local_del_swallows_type_error(monkeypatch):
     test_local = Local()
+    test_local.foo = 1
 
     blow_up_calls = 0
 
@@ -74,3 +74,22 @@ def test_async_to_sync_contextvars():
     sync_function = async_to_sync(async_function)
     assert sync_function() == 42
     assert foo.get() == "baz"
+
+
+@pytest.mark.asyncio
+async def test_sync_to_async_contextvars_replaced_with_equal():
+    """
+    Tests that a contextvar replaced with an equal but distinct value in the
+    called context is still propagated back to the calling context.
+    """
+    outer = "".join(["b", "ar"])
+    inner = "".join(["ba", "r"])
+    assert outer == inner and outer is not inner
+
+    def sync_function():
+        assert foo.get() is outer
+        foo.set(inner)
+
+    foo.set(outer)
+    await sync_to_async(sync_function)()
+    assert foo.get() is inner